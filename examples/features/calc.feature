@@ -36,3 +36,13 @@ Scenario: Adding floats
     When I add them
     Then I have float 15.6 as result
 
+
+
+@basic
+Scenario: Same step name for Given and Then
+    Given the result is 4
+    When I add 5 to the result
+    Then the result is 9
+    And the result is 9
+    But the result is not 4
+    * 3 checks are done
@@ -51,10 +51,12 @@ def i_en_de_crypt(operator, context):
             context["ans"] -= num
 
 
-@step("I have {result:d} as result")
+@step("I have {result:d} as result", kind="then")
 def i_get_answer_i(result, context):
     """Example of parameter types converted based on annotation
-    and context is a fixture as in Pytest"""
+    and context is a fixture as in Pytest
+    Step is limited to Then keyword, And, But or * after a Then,
+    so it is not compared with Given and When steps limited to their keyword"""
     assert context["ans"] == result
 
 
@@ -87,3 +89,36 @@ def i_have_a_vector(data_table, context):
     and context is a fixture as in Pytest
     Note: data_table contains strings, user has to convert"""
     assert context["vector"] == [int(x[0]) for x in data_table]
+
+
+@step("the result is {result:d}", kind="given")
+def given_result(result, context):
+    """Same step name can be used for different keywords, if the kind is given"""
+    context["ans"] = result
+    context["checks"] = 0
+
+
+@step("I add {num:d} to the result")
+def i_add_to_the_result(num, context):
+    """Step without kind, usable for all keywords"""
+    context["ans"] += num
+
+
+@step("the result is {result:d}", kind="then")
+def then_result(result, context):
+    """Then version of the step, And, But or * after a Then is using it too"""
+    assert context["ans"] == result
+    context["checks"] += 1
+
+
+@step("the result is not {result:d}", kind="then")
+def then_result_is_not(result, context):
+    """Only for Then keyword, And, But or * after a Then"""
+    assert context["ans"] != result
+    context["checks"] += 1
+
+
+@step("{count:d} checks are done", kind="then")
+def checks_are_done(count, context):
+    """Given version of the result step would reset the checks"""
+    assert context["checks"] == count
@@ -4,4 +4,5 @@ call create_test_env.bat
 call install.bat
 flake8 src tests
 pytest
+python import_time.py
 call testenv\Scripts\deactivate
@@ -0,0 +1,44 @@
+"""Check the import cost of the Pytest plugin, when BDD is not used
+
+Pytest imports the plugin in every run, so it must stay cheap.
+Heavy modules must not be imported and the time must stay below the limit.
+Usage: python import_time.py [limit_in_ms]
+"""
+
+import subprocess
+import sys
+
+HEAVY_MODULES = ("gherkin", "parse", "pt_gh.nodes", "pt_gh.threads", "pt_gh.dry_run")
+LIMIT_MS = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+RUNS = 5
+
+
+def measure():
+    """Import the plugin after Pytest with -X importtime,
+    return the cumulative plugin time in ms and the imported module names"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pytest; import pt_gh.plugin"],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    lines = result.stderr.splitlines()
+    # Plugin lines are after the Pytest import
+    start = max(i for i, line in enumerate(lines) if line.endswith("| pytest"))
+    modules = [line.split("|")[-1].strip() for line in lines[start + 1 :]]
+    plugin_line = [line for line in lines if line.endswith("| pt_gh.plugin")][-1]
+    cumulative_us = int(plugin_line.split("|")[1])
+    return cumulative_us / 1000, modules
+
+
+times = []
+for _ in range(RUNS):
+    elapsed, imported = measure()
+    times.append(elapsed)
+heavy = [m for m in imported if m.split(".")[0] in HEAVY_MODULES or m in HEAVY_MODULES]
+best = min(times)
+print("Plugin import time: {:.2f} ms (limit {:.2f} ms)".format(best, LIMIT_MS))
+if heavy:
+    print("Heavy modules imported: " + ", ".join(heavy))
+if heavy or best > LIMIT_MS:
+    sys.exit(1)
@@ -0,0 +1,58 @@
+"""Compare the speed of the fast parser and the Gherkin library
+
+Feature files are parsed and compiled to pickles by both, best of some runs.
+Files not handled by the fast parser are listed, they fall back to Gherkin.
+Correctness is checked by tests/test_fast_parser.py.
+Usage: python parser_benchmark.py [FEATURE_FILE_OR_FOLDER ...]
+"""
+
+import pathlib
+import sys
+import time
+
+from gherkin.parser import Parser
+from gherkin.pickles import compiler
+
+from pt_gh import fast_parser
+
+DEFAULT_PATHS = ("tests/fast_parser/same", "examples/features")
+RUNS = 5
+
+
+def best_time(func, text):
+    """Best run time of the function for the text, in seconds"""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func(text)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def gherkin_compile(text):
+    """Parse and compile with the Gherkin library"""
+    return compiler.compile(Parser().parse(text))
+
+
+files = []
+for path in map(pathlib.Path, sys.argv[1:] or DEFAULT_PATHS):
+    files.extend(sorted(path.rglob("*.feature")) if path.is_dir() else [path])
+fast_total = gherkin_total = 0.0
+fallbacks = 0
+for path in files:
+    text = path.read_text(encoding="utf-8")
+    try:
+        fast_parser.compile_pickles(text)
+    except fast_parser.Unsupported as error:
+        fallbacks += 1
+        print("Fallback {}: {}".format(path, error))
+        continue
+    gherkin_total += best_time(gherkin_compile, text)
+    fast_total += best_time(fast_parser.compile_pickles, text)
+print("{} files, {} fallbacks".format(len(files), fallbacks))
+if fast_total:
+    print(
+        "Gherkin: {:.2f} ms, fast: {:.2f} ms, {:.1f}x".format(
+            gherkin_total * 1000, fast_total * 1000, gherkin_total / fast_total
+        )
+    )
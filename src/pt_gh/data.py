@@ -2,8 +2,11 @@
 
 
 _AVAILABLE_STEP_FUNCTIONS = list()
+# Steps usable for Given, When and Then keywords, including the unscoped ones
+_KIND_STEP_FUNCTIONS = dict(given=list(), when=list(), then=list())
 _MISSING_STEP_FUNCTIONS = list()
 _GHERKIN_ERRORS = list()
+_FAILED_PREFIXES = dict()
 
 
 def add_error(msg):
@@ -19,11 +22,16 @@ def get_errors():
 def add_step(step):
     """Add a step to the available steps"""
     _AVAILABLE_STEP_FUNCTIONS.append(step)
+    for kind, steps in _KIND_STEP_FUNCTIONS.items():
+        if step.kind in (None, kind):
+            steps.append(step)
 
 
-def get_steps():
-    """Get all the available steps"""
-    return _AVAILABLE_STEP_FUNCTIONS
+def get_steps(kind=None):
+    """Get the available steps, for the given kind if it is known"""
+    if kind is None:
+        return _AVAILABLE_STEP_FUNCTIONS
+    return _KIND_STEP_FUNCTIONS[kind]
 
 
 def add_missing_step(step):
@@ -34,3 +42,13 @@ def add_missing_step(step):
 def get_missing_steps():
     """Get all the missing steps"""
     return _MISSING_STEP_FUNCTIONS
+
+
+def add_failed_prefix(prefix, scenario_id):
+    """Add a failed step sequence, with the first scenario where it failed"""
+    _FAILED_PREFIXES.setdefault(prefix, scenario_id)
+
+
+def get_failed_prefix(prefix):
+    """Return the scenario where the step sequence failed, or None"""
+    return _FAILED_PREFIXES.get(prefix)
@@ -0,0 +1,132 @@
+"""Pytest Gherkin plugin dry run
+
+Scenarios are only bound to step functions and fixtures, nothing is executed.
+Problems are written to the terminal, the result can be saved as a JSON report.
+Results are cached per feature file, the cache is valid while the feature file,
+the step modules and the fixtures are unchanged.
+"""
+
+import hashlib
+import inspect
+import json
+
+from . import data
+from . import utils
+from .version import __version__
+
+
+CACHE_PREFIX = "pt_gh/dry_run/"
+
+REPORT = None
+
+
+def steps_digest(session):
+    """Hash of the step modules, step definitions, available fixtures
+    and the source of the local files defining the fixtures"""
+    digest = hashlib.sha256(__version__.encode())
+    files = set()
+    for step_function in data.get_steps():
+        digest.update(repr((step_function.step_name, step_function.kind)).encode())
+        files.add(inspect.getsourcefile(step_function.function))
+    rootdir = str(session.config.rootdir)
+    fixture_mgr = session._fixturemanager  # pylint: disable=protected-access
+    for name, fixturedefs in sorted(fixture_mgr._arg2fixturedefs.items()):
+        for fixturedef in fixturedefs:
+            digest.update(
+                repr(
+                    (name, fixturedef.baseid, fixturedef.scope, fixturedef.argnames)
+                ).encode()
+            )
+            file_name = inspect.getsourcefile(fixturedef.func)
+            if file_name and file_name.startswith(rootdir):
+                files.add(file_name)  # Installed plugins are not hashed
+    for file_name in sorted(files):
+        with open(file_name, "rb") as handle:
+            digest.update(handle.read())
+    digest.update(repr(session.config.getoption("bdd_tags")).encode())
+    return digest.hexdigest()
+
+
+def validate_scenario(item):
+    """Bind the scenario and return its validation result"""
+    errors = data.get_errors()
+    missing_steps = data.get_missing_steps()
+    errors_before, missing_before = len(errors), len(missing_steps)
+    item.verify_and_process_scenario()
+    fixtureinfo = item._fixtureinfo  # pylint: disable=protected-access
+    result = dict(
+        name=item.name,
+        nodeid=item.nodeid,
+        errors=errors[errors_before:],
+        missing_steps=missing_steps[missing_before:],
+        missing_fixtures=[
+            name
+            for name in item.fixturenames
+            if name not in fixtureinfo.name2fixturedefs and name != "request"
+        ],
+    )
+    result["ok"] = not (
+        result["errors"] or result["missing_steps"] or result["missing_fixtures"]
+    )
+    return result
+
+
+def validate(session, items):
+    """Validate all scenarios, feature by feature, using the cache if possible"""
+    global REPORT
+    REPORT = dict(ok=True, errors=list(data.get_errors()), features=[])
+    cache = getattr(session.config, "cache", None)
+    digest = steps_digest(session)
+    features = dict()
+    for item in items:
+        features.setdefault(item.feature, []).append(item)
+    for feature, scenarios in features.items():
+        feature_digest = hashlib.sha256(
+            (digest + feature.gherkin_text).encode()
+        ).hexdigest()
+        cache_key = CACHE_PREFIX + feature.nodeid
+        cached = cache.get(cache_key, None) if cache else None
+        if cached and cached["digest"] == feature_digest:
+            results = cached["scenarios"]
+        else:
+            cached = None
+            results = [validate_scenario(item) for item in scenarios]
+            if cache:
+                cache.set(cache_key, dict(digest=feature_digest, scenarios=results))
+        REPORT["features"].append(
+            dict(path=feature.nodeid, cached=cached is not None, scenarios=results)
+        )
+    REPORT["ok"] = not REPORT["errors"] and all(
+        result["ok"]
+        for feature in REPORT["features"]
+        for result in feature["scenarios"]
+    )
+
+
+def write_report(path):
+    """Write the JSON report to the file"""
+    with open(path, "w") as handle:
+        json.dump(REPORT, handle, indent=2)
+
+
+def write_summary():
+    """Write the problems and the result to the terminal"""
+    for error in REPORT["errors"]:
+        utils.write_msg("ERROR", error)
+    scenarios = 0
+    for feature in REPORT["features"]:
+        for result in feature["scenarios"]:
+            scenarios += 1
+            if result["ok"]:
+                continue
+            utils.write_msg("ERROR", "Invalid scenario: {}".format(result["nodeid"]))
+            for problem in result["errors"]:
+                utils.write_msg("INFO", "    " + problem)
+            for missing in result["missing_steps"]:
+                utils.write_msg("INFO", "    Missing step: " + missing)
+            for missing in result["missing_fixtures"]:
+                utils.write_msg("INFO", "    Missing fixture: " + missing)
+    if REPORT["ok"]:
+        utils.write_msg("OK", "Dry run: {} scenarios are valid".format(scenarios))
+    else:
+        utils.write_msg("ERROR", "!!!!! Dry run found BDD problems !!!!!")
@@ -0,0 +1,365 @@
+"""Pytest Gherkin plugin fast parser
+
+Line based parser for the common subset of Gherkin, English only:
+Feature, Background, Scenario, Scenario Outline with Examples, tags,
+data tables and doc strings. It creates the pickles directly,
+the same as the Gherkin parser and pickle compiler do together.
+Anything else raises Unsupported, then the Gherkin library has to be used.
+
+Differential tests against the Gherkin library are in tests/test_fast_parser.py,
+the speed can be compared with parser_benchmark.py.
+"""
+
+import re
+
+
+LANGUAGE_RE = re.compile(r"^\s*#\s*language\s*:\s*([a-zA-Z\-_]+)\s*$")
+FEATURE_KEYWORDS = ("Feature", "Business Need", "Ability")
+BACKGROUND_KEYWORDS = ("Background",)
+SCENARIO_KEYWORDS = ("Scenario",)
+SCENARIO_OUTLINE_KEYWORDS = ("Scenario Outline", "Scenario Template")
+EXAMPLES_KEYWORDS = ("Examples", "Scenarios")
+STEP_KEYWORDS = ("* ", "Given ", "When ", "Then ", "And ", "But ")
+DOC_STRING_SEPARATORS = ('"""', "```")
+
+
+class Unsupported(Exception):
+    """Feature file content, which is not handled by the fast parser"""
+
+
+class _Line:
+
+    """One line of the feature file, as the Gherkin library sees it"""
+
+    def __init__(self, text, number):
+        self.text = text  # Including the line end
+        self.number = number
+        self.trimmed = text.lstrip()
+        self.indent = len(text) - len(self.trimmed)
+
+    def location(self):
+        """Location of the line content"""
+        return {"line": self.number, "column": self.indent + 1}
+
+    def title(self, keywords):
+        """Return keyword and title for a matching title line"""
+        for keyword in keywords:
+            if self.trimmed.startswith(keyword + ":"):
+                return keyword, self.trimmed[len(keyword) + 1 :].strip()
+        return None
+
+    def step(self):
+        """Return keyword and text for a matching step line"""
+        for keyword in STEP_KEYWORDS:
+            if self.trimmed.startswith(keyword):
+                return keyword, self.trimmed[len(keyword) :].strip()
+        return None
+
+    def tags(self):
+        """Return the tags of a tag line"""
+        if "#" in self.trimmed:
+            raise Unsupported("Comment in tag line {}".format(self.number))
+        column = self.indent + 1
+        tags = []
+        for item in self.trimmed.strip().split("@")[1:]:
+            location = {"line": self.number, "column": column}
+            tags.append({"name": "@" + item.strip(), "location": location})
+            column += len(item) + 1
+        return tags
+
+    def cells(self):
+        """Return the cells of a table row, with Gherkin escapes"""
+        cells = []
+        row = self.trimmed.strip()
+        position = 0
+        start = None
+        value = ""
+        while position < len(row):
+            char = row[position]
+            position += 1
+            if char == "|":
+                if start is not None:
+                    cells.append(self._cell(value, start))
+                value = ""
+                start = position + 1
+            elif char == "\\":
+                if position == len(row):
+                    raise Unsupported("Bad escape in table row {}".format(self.number))
+                char = row[position]
+                position += 1
+                if char == "n":
+                    value += "\n"
+                else:
+                    if char not in ("|", "\\"):
+                        value += "\\"
+                    value += char
+            else:
+                value += char
+        return cells
+
+    def _cell(self, value, start):
+        """Build a cell with Gherkin location"""
+        cell_indent = len(value) - len(value.lstrip())
+        column = start + self.indent + cell_indent
+        location = {"line": self.number, "column": column}
+        return {"location": location, "value": value.strip()}
+
+
+class _Parser:
+
+    """Fast parser state machine, creating Gherkin like definitions"""
+
+    def __init__(self, gherkin_text):
+        if "\r" in gherkin_text:
+            raise Unsupported("Carriage return in text")
+        texts = gherkin_text.split("\n")
+        texts = [text + "\n" for text in texts[:-1]] + [texts[-1]]
+        self.lines = [
+            _Line(text, number) for number, text in enumerate(texts, 1) if text
+        ]
+        self.feature = None
+        self.definitions = []
+        self.tags = []  # Tags waiting for the next tagged element
+        self.state = "start"
+        self.examples = None  # Current examples of scenario outline
+
+    def parse(self):
+        """Process all lines"""
+        index = 0
+        while index < len(self.lines):
+            line = self.lines[index]
+            index += 1
+            match = LANGUAGE_RE.match(line.trimmed)
+            if match and match.group(1) != "en":
+                raise Unsupported("Language: " + match.group(1))
+            if not line.trimmed:
+                continue
+            if line.trimmed.startswith("#"):
+                if self.state.endswith("description"):
+                    self.state = self.state.replace("description", "comment")
+                continue
+            if line.trimmed.startswith(DOC_STRING_SEPARATORS) and self.state == "steps":
+                index = self.doc_string(index - 1)
+            elif not self.match(line):
+                raise Unsupported("Unexpected line {}".format(line.number))
+        if self.tags or self.feature is None:
+            raise Unsupported("Unexpected end of file")
+
+    def match(self, line):
+        """Process one line, return False if it is not allowed"""
+        if self.state in ("steps", "definition_description", "definition_comment"):
+            step = line.step()
+            if step:
+                self.add_step(line, *step)
+                return True
+        if line.trimmed.startswith("|") and self.state in ("steps", "examples"):
+            return self.add_row(line)
+        if line.trimmed.startswith("|") and self.state.startswith("examples_"):
+            self.state = "examples"
+            return self.add_row(line)
+        if line.trimmed.startswith("@"):
+            self.tags.extend(line.tags())
+            return True
+        if self.match_title(line):
+            return True
+        if self.state.endswith("description") and not self.tags:
+            return True  # Description is not needed for pickles
+        return False
+
+    def match_title(self, line):
+        """Process Feature, Background, Scenario and Examples lines"""
+        title = line.title(FEATURE_KEYWORDS)
+        if title:
+            if self.state != "start":
+                raise Unsupported("Second feature in line {}".format(line.number))
+            self.feature = {"tags": self.pop_tags()}
+            self.state = "feature_description"
+            return True
+        if self.feature is None:
+            return False
+        title = line.title(BACKGROUND_KEYWORDS)
+        if title:
+            if self.definitions or self.tags:
+                raise Unsupported("Unexpected background, line {}".format(line.number))
+            self.add_definition("Background", line, title[1])
+            return True
+        title = line.title(SCENARIO_KEYWORDS)
+        if title:
+            self.add_definition("Scenario", line, title[1])
+            return True
+        title = line.title(SCENARIO_OUTLINE_KEYWORDS)
+        if title:
+            self.add_definition("ScenarioOutline", line, title[1])
+            return True
+        title = line.title(EXAMPLES_KEYWORDS)
+        if title:
+            outline = self.definitions[-1] if self.definitions else None
+            if outline is None or outline["type"] != "ScenarioOutline":
+                raise Unsupported("Unexpected examples in line {}".format(line.number))
+            self.examples = {"tags": self.pop_tags(), "rows": []}
+            outline["examples"].append(self.examples)
+            self.state = "examples_description"
+            return True
+        return False
+
+    def pop_tags(self):
+        """Return the collected tags and start a new collection"""
+        tags, self.tags = self.tags, []
+        return tags
+
+    def add_definition(self, kind, line, name):
+        """Start a new Background, Scenario or Scenario Outline"""
+        definition = {
+            "type": kind,
+            "tags": self.pop_tags(),
+            "location": line.location(),
+            "name": name,
+            "steps": [],
+            "examples": [],
+        }
+        self.definitions.append(definition)
+        self.state = "definition_description"
+
+    def add_step(self, line, keyword, text):
+        """Add a step to the current definition"""
+        if self.tags:
+            raise Unsupported("Tags before step in line {}".format(line.number))
+        location = line.location()
+        location["column"] += len(keyword)
+        self.definitions[-1]["steps"].append(
+            {"text": text, "argument": None, "location": location}
+        )
+        self.state = "steps"
+
+    def add_row(self, line):
+        """Add a table row to the step data table or to the examples"""
+        if self.tags:
+            return False
+        row = {"location": line.location(), "cells": line.cells()}
+        if self.state == "examples":
+            rows = self.examples["rows"]
+        else:
+            step = self.definitions[-1]["steps"][-1]
+            if step["argument"] is None:
+                step["argument"] = {"rows": []}
+            if "rows" not in step["argument"]:
+                return False
+            rows = step["argument"]["rows"]
+        if rows and len(rows[0]["cells"]) != len(row["cells"]):
+            raise Unsupported("Inconsistent cell count in line {}".format(line.number))
+        rows.append(row)
+        return True
+
+    def doc_string(self, index):
+        """Process a doc string, return the index of the next line"""
+        opening = self.lines[index]
+        step = self.definitions[-1]["steps"][-1]
+        if step["argument"] is not None or self.tags:
+            raise Unsupported("Unexpected doc string in line {}".format(opening.number))
+        separator = opening.trimmed[:3]
+        content = []
+        for line in self.lines[index + 1 :]:
+            if line.trimmed.startswith(separator):
+                step["argument"] = {
+                    "location": opening.location(),
+                    "content": "\n".join(content),
+                }
+                return line.number
+            if opening.indent > line.indent:
+                text = line.trimmed
+            else:
+                text = line.text[opening.indent :]
+            content.append(text.rstrip("\r\n").replace('\\"\\"\\"', '"""'))
+        raise Unsupported("Doc string is not closed in line {}".format(opening.number))
+
+
+def compile_pickles(gherkin_text):
+    """Parse the feature file text and return the Gherkin pickles"""
+    parser = _Parser(gherkin_text)
+    parser.parse()
+    pickles = []
+    feature_tags = parser.feature["tags"]
+    background_steps = []
+    for definition in parser.definitions:
+        if definition["type"] == "Background":
+            background_steps = [
+                _pickle_step(step, [], []) for step in definition["steps"]
+            ]
+        elif definition["type"] == "Scenario":
+            if not definition["steps"]:
+                continue
+            pickles.append(
+                {
+                    "tags": feature_tags + definition["tags"],
+                    "name": definition["name"],
+                    "language": "en",
+                    "locations": [definition["location"]],
+                    "steps": background_steps
+                    + [_pickle_step(step, [], []) for step in definition["steps"]],
+                }
+            )
+        else:
+            if definition["steps"]:
+                _compile_outline(feature_tags, background_steps, definition, pickles)
+    return pickles
+
+
+def _compile_outline(feature_tags, background_steps, outline, pickles):
+    """Create pickles from a Scenario Outline, for all examples"""
+    for examples in outline["examples"]:
+        if not examples["rows"]:
+            continue
+        variables = examples["rows"][0]["cells"]
+        for row in examples["rows"][1:]:
+            values = row["cells"]
+            steps = list(background_steps)
+            for step in outline["steps"]:
+                pickle_step = _pickle_step(step, variables, values)
+                pickle_step["locations"].insert(0, row["location"])
+                steps.append(pickle_step)
+            pickles.append(
+                {
+                    "name": _interpolate(outline["name"], variables, values),
+                    "language": "en",
+                    "steps": steps,
+                    "tags": feature_tags + outline["tags"] + examples["tags"],
+                    "locations": [row["location"], outline["location"]],
+                }
+            )
+
+
+def _pickle_step(step, variables, values):
+    """Create a pickle step, with the interpolated text and arguments"""
+    arguments = []
+    argument = step["argument"]
+    if argument and "rows" in argument:
+        rows = []
+        for row in argument["rows"]:
+            cells = [
+                {
+                    "location": cell["location"],
+                    "value": _interpolate(cell["value"], variables, values),
+                }
+                for cell in row["cells"]
+            ]
+            rows.append({"cells": cells})
+        arguments.append({"rows": rows})
+    elif argument:
+        arguments.append(
+            {
+                "location": argument["location"],
+                "content": _interpolate(argument["content"], variables, values),
+            }
+        )
+    return {
+        "text": _interpolate(step["text"], variables, values),
+        "arguments": arguments,
+        "locations": [step["location"]],
+    }
+
+
+def _interpolate(name, variables, values):
+    """Replace the <variable> marks, exactly as the Gherkin library does"""
+    for variable, value in zip(variables, values):
+        name = re.sub("<{}>".format(variable["value"]), value["value"], name)
+    return name
@@ -30,3 +30,8 @@ def pytest_gherkin_before_step(step, scenario):
 
 def pytest_gherkin_after_step(step, scenario):
     """Called after step function is successfully executed."""
+
+
+def pytest_gherkin_step_finished(step, scenario, status, duration):
+    """Called after step is finished, even if it failed or not executed.
+    Status is "passed", "failed" or "skipped", duration is in seconds."""
@@ -1,20 +1,28 @@
 """Pytest Gherkin plugin nodes"""
 
+import functools
 import inspect
+import itertools
+import time
 
 import parse
 import pytest
-from _pytest.fixtures import FixtureRequest, FixtureLookupError
+from _pytest.fixtures import FixtureRequest, FixtureLookupError, FuncFixtureInfo
+from _pytest.python import Module
+from gherkin.dialect import Dialect
 from gherkin.parser import Parser
 from gherkin.pickles import compiler
 
 from . import data
+from . import fast_parser
+from . import tags
 from . import utils
 
 
 DATA_TABLE = "data_table"
 MULTI_LINE = "multi_line"
 RESERVED_NAMES = (DATA_TABLE, MULTI_LINE)
+STEP_KINDS = ("given", "when", "then")
 
 
 class GherkinException(Exception):
@@ -25,10 +33,13 @@ class StepFunction:
 
     """Step functions with step name, parse and check"""
 
-    def __init__(self, function, step_name, extra_types=None):
+    def __init__(self, function, step_name, extra_types=None, kind=None):
         utils.write_debug("Registering step: {}".format(step_name))
+        if kind is not None and kind not in STEP_KINDS:
+            raise GherkinException("Unknown step kind: {} {}".format(kind, step_name))
         self.function = function
         self.step_name = step_name
+        self.kind = kind  # None: usable for all keywords
         self.name_to_check = step_name.replace("{", "").replace("}", "")
         self.name_parser = parse.compile(step_name, extra_types=extra_types)
 
@@ -50,8 +61,9 @@ class StepFunction:
 
     def search_and_report_similar(self):
         """Compare the step name with already collected step names
-        if similarity found then report as error"""
-        for other in data.get_steps():
+        if similarity found then report as error
+        Steps of different kinds are not compared"""
+        for other in data.get_steps(self.kind):
             if self.match_similar(other):
                 data.add_error(
                     "Similar step name was already declared:\n    {} \n    {}".format(
@@ -60,11 +72,40 @@ class StepFunction:
                 )
 
 
-def search_step_function(step_text):
-    """Find the matching step from the available steps"""
-    for step_function in data.get_steps():
+@functools.lru_cache(maxsize=None)
+def dialect_step_kinds(language):
+    """Return the step kinds of the step keywords of a Gherkin language,
+    None for And, But and * keywords"""
+    dialect = Dialect.for_name(language)
+    kinds = dict()
+    for kind in STEP_KINDS:
+        for keyword in getattr(dialect, kind + "_keywords"):
+            kinds[keyword.strip()] = kind
+    for keyword in dialect.and_keywords + dialect.but_keywords:
+        kinds[keyword.strip()] = None
+    return kinds
+
+
+def step_kind(keyword, previous_kind, language="en"):
+    """Return the step kind of a Gherkin keyword in the feature language,
+    And, But and * keywords continue the previous kind"""
+    kind = dialect_step_kinds(language).get(keyword)
+    if kind is None:
+        return previous_kind
+    return kind
+
+
+def search_step_function(step_text, kind=None):
+    """Find the matching step from the available steps
+    Without known kind, steps of more kinds matching is ambiguous"""
+    step_functions = data.get_steps(kind)
+    for index, step_function in enumerate(step_functions):
         match = step_function.parse(step_text)
         if match:
+            if kind is None:
+                report_ambiguous_step(
+                    step_text, step_function, step_functions[index + 1 :]
+                )
             return step_function
     # At collection time report errors
     # Assumption: this will not happen at execution time
@@ -72,6 +113,21 @@ def search_step_function(step_text):
     return None
 
 
+def report_ambiguous_step(step_text, step_function, other_functions):
+    """Report the other matching step functions as error"""
+    others = [other for other in other_functions if other.parse(step_text)]
+    if others:
+        data.add_error(
+            "Step kind is not known, more steps match: {}\n    {}".format(
+                step_text,
+                "\n    ".join(
+                    "{} ({})".format(other.step_name, other.kind)
+                    for other in [step_function] + others
+                ),
+            )
+        )
+
+
 class FeatureFile(pytest.File):
 
     """Feature file implementation"""
@@ -80,18 +136,57 @@ class FeatureFile(pytest.File):
         """Collect and return scenarios from a feature file
         Gherkin pickles are used, so scenario outlines are already processed"""
         utils.write_msg("INFO", "Collecting file: {}".format(self.fspath))
-        parser = Parser()
         # Read the file, parse and compile
         # keep all this, so later we can check if needed
         # Gherkin pickles compile Scenario Outlines,
         # so far we use this implementation
         with self.fspath.open() as handle:
             self.gherkin_text = handle.read()
-        self.gherkin_document = parser.parse(self.gherkin_text)
-        self.gherkin_pickles = compiler.compile(self.gherkin_document)
+        self.gherkin_lines = self.gherkin_text.split("\n")
+        # Tag expression filter, skip the file cheaply if nothing can match
+        tag_expression = tags.compile_expression(self.config.getoption("bdd_tags"))
+        if tag_expression and not tag_expression.may_match(
+            tags.scan_tags(self.gherkin_text)
+        ):
+            utils.write_debug("Skipping file by tags: {}".format(self.fspath))
+            return
+        self.gherkin_document = None  # Not created by the fast parser
+        self.gherkin_pickles = None
+        if self.config.getoption("bdd_parser") == "fast":
+            try:
+                self.gherkin_pickles = fast_parser.compile_pickles(self.gherkin_text)
+            except fast_parser.Unsupported as error:
+                utils.write_debug("Fast parser fallback: {}".format(error))
+        if self.gherkin_pickles is None:
+            self.gherkin_document = Parser().parse(self.gherkin_text)
+            self.gherkin_pickles = compiler.compile(self.gherkin_document)
+        # Fixture closures, shared by scenarios with the same fixture needs
+        self.fixture_infos = dict()
         for scenario in self.gherkin_pickles:
+            if tag_expression:
+                scenario_tags = {tag["name"] for tag in scenario["tags"]}
+                if not tag_expression.evaluate(scenario_tags):
+                    continue
             yield ScenarioItem(scenario=scenario, parent=self)
 
+    def get_step_keyword(self, gherkin_step):
+        """Return the keyword of a pickle step from the feature file text,
+        pickles do not contain it, but the location points after the keyword"""
+        location = gherkin_step["locations"][-1]
+        line = self.gherkin_lines[location["line"] - 1]
+        return line[: location["column"] - 1].strip()
+
+    def get_fixture_info(self, fixture_names):
+        """Return the fixture closure for the given fixture names.
+        Fixture visibility is the same for all scenarios of the file,
+        so closure is computed only once for the same names."""
+        key = tuple(fixture_names)
+        if key not in self.fixture_infos:
+            fixture_mgr = self.session._fixturemanager
+            closure = fixture_mgr.getfixtureclosure(key, self)
+            self.fixture_infos[key] = FuncFixtureInfo(key, *closure)
+        return self.fixture_infos[key]
+
 
 class ScenarioItem(pytest.Item):
 
@@ -103,12 +198,6 @@ class ScenarioItem(pytest.Item):
         utils.write_debug("Collecting scenario: {}".format(scenario_name))
         super().__init__(scenario_name, parent)
 
-        # Hacking self, to enable build FixtureRequest object
-        fixture_mgr = self.session._fixturemanager
-        self._fixtureinfo = fixture_mgr.getfixtureinfo(
-            node=self, func=None, cls=None, funcargs=False
-        )
-
         # Keep references of compiled scenario pickle and feature
         self.scenario = scenario  # Gherkin pickled scenario
         self.feature = parent  # Shortcut to the FeatureFile
@@ -116,50 +205,117 @@ class ScenarioItem(pytest.Item):
         # Fixtures are needed for scenario level, initialize containers
         self.fixture_names = set()  # Names of the needed fixtures
         self.fixture_parameters = dict()  # Actual fixtures, filled at setup
+        # Pytest fixture handling, filled with verify and process call
+        self._fixtureinfo = None
+        self.fixturenames = ()
+        self.funcargs = dict()
 
         # Steps, filled with verify and process call
         self.steps = []
+        self.failed_prefix = None  # Failure message, if the first steps failed before
 
         # Apply tags as pytest marks
         for tag in scenario["tags"]:
             tag_name = tag["name"].lstrip("@")
             self.config.hook.pytest_gherkin_apply_tag(tag=tag_name, scenario=self)
 
+    def getparent(self, cls):
+        """Feature file is the module of the scenario,
+        so module scoped fixtures are living for a feature file"""
+        if cls is Module:
+            return self.feature
+        return super().getparent(cls)
+
     def verify_and_process_scenario(self):
         """Process all steps, by locating step functions and creating scenario steps.
         Locating and creating actions verify that all steps exists and have good parameters.
         Meanwhile collecting problems to data gherkin errors.
         Processing is also creating a set of needed fixtures (not checked here)."""
         utils.write_debug("Verify and process scenario: {}".format(self.name))
+        kind = None
+        language = self.scenario["language"]
         for gherkin_step in self.scenario["steps"]:
-            step_function = search_step_function(gherkin_step["text"])
+            keyword = self.feature.get_step_keyword(gherkin_step)
+            kind = step_kind(keyword, kind, language)
+            step_function = search_step_function(gherkin_step["text"], kind)
             if step_function:
                 scenario_step = ScenaroStep(gherkin_step, step_function, self)
                 self.steps.append(scenario_step)
                 self.fixture_names |= scenario_step.fixture_needs
+        # Fixture closure is computed once, then Pytest setup plan uses it
+        usefixtures = itertools.chain.from_iterable(
+            mark.args for mark in self.iter_markers(name="usefixtures")
+        )
+        self._fixtureinfo = self.feature.get_fixture_info(
+            tuple(usefixtures) + tuple(sorted(self.fixture_names))
+        )
+        self.fixturenames = self._fixtureinfo.names_closure
 
     def setup(self):
-        """Pytest setup, here we prepare the fixtures to use"""
-        fixture_request = FixtureRequest(self)
-        # Now get all the needed fixtures for the scenario
-        # steps will later collect their needs
-        self.fixture_parameters.clear()
-        for fixture_name in self.fixture_names:
-            try:
-                self.fixture_parameters[fixture_name] = fixture_request.getfixturevalue(
-                    fixture_name
-                )
-            except FixtureLookupError:
-                raise GherkinException("Fixture not found: " + fixture_name)
+        """Pytest setup, here we prepare the fixtures to use
+        Pytest fills the fixture closure, as for normal test functions.
+        Scenarios with already failed first steps stop before the fixtures."""
+        self.check_failed_prefix()
+        if self.failed_prefix:
+            return
+        self.funcargs = dict()
+        self._request = FixtureRequest(self)
+        try:
+            self._request._fillfixtures()  # pylint: disable=protected-access
+        except FixtureLookupError as error:
+            raise GherkinException("Fixture not found: " + error.argname)
+        self.fixture_parameters = self.funcargs
 
     def runtest(self):
         """Pytest calls it to run the actual test
         We need to find the steps and execute them one-by-one"""
-        self.config.hook.pytest_gherkin_before_scenario(scenario=self)
-        utils.write_report("\n\n{0} {1} {0}".format("-" * 10, self.name))
-        for step in self.steps:
-            step.run_step(self.fixture_parameters)
-        self.config.hook.pytest_gherkin_after_scenario(scenario=self)
+        if self.failed_prefix:
+            pytest.fail(self.failed_prefix, pytrace=False)
+        executed = 0  # After a failure the remaining steps are skipped
+        try:
+            self.config.hook.pytest_gherkin_before_scenario(scenario=self)
+            utils.write_report("\n\n{0} {1} {0}".format("-" * 10, self.name))
+            for step in self.steps:
+                executed += 1
+                step.run_step(self.fixture_parameters)
+            self.config.hook.pytest_gherkin_after_scenario(scenario=self)
+        finally:
+            for step in self.steps[executed:]:
+                self.config.hook.pytest_gherkin_step_finished(
+                    step=step, scenario=self, status="skipped", duration=0.0
+                )
+
+    def check_failed_prefix(self):
+        """Do not run the scenario, if its first steps already failed in another one.
+        Skipped at setup, failures are kept for the call, reported as failed test."""
+        mode = self.config.getoption("bdd_failed_prefix")
+        if not mode:
+            return
+        keys = tuple(step.result_key() for step in self.steps)
+        for length in range(1, len(keys) + 1):
+            original = data.get_failed_prefix(keys[:length])
+            if original:
+                msg = "Step already failed in {}: {}".format(
+                    original, self.steps[length - 1].step_text
+                )
+                if mode == "skip":
+                    pytest.skip(msg)
+                self.failed_prefix = msg
+                return
+
+    def add_failed_prefix(self, failed_step):
+        """Remember the steps until the failed one, for the later scenarios"""
+        if not self.config.getoption("bdd_failed_prefix"):
+            return
+        if self.get_closest_marker("xfail"):
+            return  # Expected failures do not stop other scenarios
+        length = self.steps.index(failed_step) + 1
+        keys = tuple(step.result_key() for step in self.steps[:length])
+        data.add_failed_prefix(keys, self.nodeid)
+
+    def reportinfo(self):
+        """Location of the scenario for Pytest reports, line is zero based"""
+        return self.fspath, self.scenario["locations"][0]["line"] - 1, self.name
 
     # def repr_failure(self, excinfo):
     #     """ called when self.runtest() raises an exception. """
@@ -256,6 +412,30 @@ class ScenaroStep:
 
     def run_step(self, fixtures):
         """Run the step, with the actual fixtures"""
+        start = time.perf_counter()
+        status = "failed"
+        try:
+            self._run_step(fixtures)
+            status = "passed"
+        except pytest.skip.Exception:
+            status = "skipped"
+            raise
+        finally:
+            if status == "failed":
+                self.scenario.add_failed_prefix(self)
+            self.scenario.config.hook.pytest_gherkin_step_finished(
+                step=self,
+                scenario=self.scenario,
+                status=status,
+                duration=time.perf_counter() - start,
+            )
+
+    def result_key(self):
+        """Identity of the step result: step text and bound parameters"""
+        return (self.step_text, repr(sorted(self.call_parameters.items())))
+
+    def _run_step(self, fixtures):
+        """Run the step function, with hooks and reporting"""
         call_fixtures = dict()
         utils.write_report(self.step_text)
         utils.write_debug(
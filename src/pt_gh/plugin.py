@@ -4,12 +4,18 @@ This will be a new type of Gherkin/BDD implementation for Pytest.
 It is based on the Gherkin library and Pytest framework.
 
 Created by BigBirdCode
+
+Plugin is loaded by every Pytest run, even without BDD execution,
+therefore heavy modules (Gherkin, parse, nodes, etc.) are imported lazily,
+when BDD execution is enabled or the step decorator is first used.
 """
 
+# pragma pylint: disable=import-outside-toplevel
+
+import sys
+
 import pytest
-from parse import with_pattern
 
-from .nodes import FeatureFile, StepFunction
 from . import data
 from . import generate
 from . import hooks
@@ -45,12 +51,94 @@ def pytest_addoption(parser):
         default=False,
         help="Enable BDD test debug messages on the terminal",
     )
+    group.addoption(
+        "--bdd_threads",
+        action="store",
+        dest="bdd_threads",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Run BDD scenarios concurrently on N threads. Scenarios tagged with "
+        "@serial or marked with skip, skipif or xfail run alone, in the normal way. "
+        "Note, for the concurrent scenarios the runtest hooks of Pytest and other "
+        "plugins (e.g. output and log capturing) are bypassed.",
+    )
+    group.addoption(
+        "--bdd_dry_run",
+        action="store_true",
+        dest="bdd_dry_run",
+        default=False,
+        help="Only validate BDD scenario steps and fixtures, without running. "
+        "Implies --bdd.",
+    )
+    group.addoption(
+        "--bdd_dry_run_report",
+        action="store",
+        dest="bdd_dry_run_report",
+        default=None,
+        metavar="PATH",
+        help="Write the BDD dry run result to PATH, as JSON. Implies --bdd_dry_run.",
+    )
+    group.addoption(
+        "--bdd_results",
+        action="store",
+        dest="bdd_results",
+        default=None,
+        metavar="PATH",
+        help="Write BDD step and scenario results to PATH, as JSON lines",
+    )
+    group.addoption(
+        "--bdd_failed_prefix",
+        action="store",
+        dest="bdd_failed_prefix",
+        choices=["skip", "fail"],
+        default=None,
+        help="Skip or fail BDD scenarios without running them, "
+        "if their first steps already failed in a previous scenario",
+    )
+    group.addoption(
+        "--bdd_parser",
+        action="store",
+        dest="bdd_parser",
+        choices=["gherkin", "fast"],
+        default="gherkin",
+        help="Feature file parser. The fast one handles the common Gherkin subset, "
+        "for other files it falls back to the Gherkin library.",
+    )
+    group.addoption(
+        "--bdd_tags",
+        action="store",
+        dest="bdd_tags",
+        default="",
+        metavar="EXPRESSION",
+        help='Only collect BDD scenarios matching the tag expression, '
+        'e.g. "@smoke and not (@slow or @wip)"',
+    )
 
 
 @pytest.mark.trylast
 def pytest_configure(config):
     """Configure plugin"""
     utils.set_config(config)
+    if config.getoption("bdd_dry_run_report"):
+        config.option.bdd_dry_run = True
+    if config.getoption("bdd_dry_run"):
+        config.option.bdd_execution = True
+    if config.getoption("bdd_tags"):
+        from . import tags
+
+        try:
+            tags.compile_expression(config.getoption("bdd_tags"))
+        except tags.TagExpressionError as error:
+            raise pytest.UsageError(str(error))
+    if config.getoption("bdd_results"):
+        from . import results
+
+        # xdist workers write their own files, merged by the controller
+        worker = getattr(config, "workerinput", dict()).get("workerid")
+        writer = results.ResultWriter(config.getoption("bdd_results"), worker)
+        config.pluginmanager.register(writer, "pt_gh_results")
+    config.addinivalue_line("markers", "serial: BDD scenario not to run concurrently")
 
 
 def pytest_addhooks(pluginmanager):
@@ -64,6 +152,8 @@ def pytest_collect_file(parent, path):
         return None
     # BDD execution, processing feature files
     if path.ext == ".feature":
+        from .nodes import FeatureFile
+
         return FeatureFile(path, parent)
     return None
 
@@ -78,6 +168,13 @@ def pytest_collection_modifyitems(session, config, items):  # pylint: disable=un
     # BDD execution
     # Remove all non-BDD tests
     items[:] = [item for item in items if hasattr(item, "verify_and_process_scenario")]
+    if config.getoption("bdd_dry_run"):
+        # Validate only, nothing to run
+        from . import dry_run
+
+        dry_run.validate(session, items)
+        items.clear()
+        return
     # Process the BDD tests, i.e. scenario items
     for item in items:
         item.verify_and_process_scenario()
@@ -91,6 +188,14 @@ def pytest_collection_finish(session):  # pylint: disable=unused-argument
     """ called after collection has been performed and modified.
     BDD errors will be reported here
     """
+    if session.config.getoption("bdd_dry_run"):
+        from . import dry_run
+
+        if dry_run.REPORT:
+            dry_run.write_summary()
+            if session.config.getoption("bdd_dry_run_report"):
+                dry_run.write_report(session.config.getoption("bdd_dry_run_report"))
+            return
     collected_errors = data.get_errors()
     missing_steps = data.get_missing_steps()
     if not collected_errors and not missing_steps:
@@ -109,6 +214,30 @@ def pytest_collection_finish(session):  # pylint: disable=unused-argument
     utils.write_msg("ERROR", "!!!!! Exit because of BDD problems !!!!!")
 
 
+@pytest.mark.tryfirst
+def pytest_runtestloop(session):
+    """Run the scenarios on a thread pool, if it was requested"""
+    config = session.config
+    if not config.getoption("bdd_execution") or config.getoption("bdd_threads") < 2:
+        return None
+    if session.testsfailed or config.option.collectonly:
+        # Let Pytest handle the collection problems and collect only mode
+        return None
+    from . import threads
+
+    threads.ThreadedRunner(session, config.getoption("bdd_threads")).run()
+    return True
+
+
+def pytest_sessionfinish(session):
+    """Dry run exit status shows the validation result"""
+    if session.config.getoption("bdd_dry_run"):
+        from . import dry_run
+
+        if dry_run.REPORT:
+            session.exitstatus = 0 if dry_run.REPORT["ok"] else 1
+
+
 # ------------------------------------------------
 # Plugin hooks, default implementations
 # ------------------------------------------------
@@ -136,6 +265,7 @@ def value_options(*args):
     Note: When user add a wrong value,
     it will not match and reported as not implemented step!
     """
+    from parse import with_pattern
 
     @with_pattern(r"|".join(args))
     def parse_options(text):
@@ -155,12 +285,21 @@ def context():
 # ------------------------------------------------
 
 
-def step(step_name, extra_types=None):
-    """Step decorator, all Given-When-Then steps use this same decorator"""
+def step(step_name, extra_types=None, kind=None):
+    """Step decorator, all Given-When-Then steps use this same decorator
+    Optionally a step can be limited to "given", "when" or "then" keywords,
+    module level default can be set by BDD_STEP_KIND variable.
+    And, But and * keywords count as the previous keyword."""
 
     def decorator(func):
         # Register the step, other way return the function unchanged
-        step_function = StepFunction(func, step_name, extra_types)
+        from .nodes import StepFunction
+
+        step_kind = kind
+        if step_kind is None:
+            module = sys.modules.get(func.__module__)
+            step_kind = getattr(module, "BDD_STEP_KIND", None)
+        step_function = StepFunction(func, step_name, extra_types, step_kind)
         # Check for similar steps, in both directions
         step_function.search_and_report_similar()
         # Register it
@@ -0,0 +1,95 @@
+"""Pytest Gherkin plugin step level results
+
+Results are written as newline delimited JSON, one record per finished
+step and scenario, as they finish. Nothing is kept in memory.
+Threads write the same file under a lock. xdist workers write their own
+PATH.<worker> files, the controller merges them into PATH at the end,
+so no file is shared by processes.
+"""
+
+import glob
+import json
+import os
+import shutil
+import threading
+
+import pytest
+
+
+class ResultWriter:
+
+    """Pytest plugin, writing the step and scenario results"""
+
+    def __init__(self, path, worker=None):
+        self.path = path
+        self.worker = worker  # xdist worker id, None for the controller
+        if worker is None:
+            self.remove_worker_files()  # Left from a broken run
+        else:
+            path = "{}.{}".format(path, worker)
+        self.handle = open(path, "w", encoding="utf-8")
+        self.lock = threading.Lock()
+
+    def worker_files(self):
+        """Return the result files of the xdist workers"""
+        return sorted(glob.glob(glob.escape(self.path) + ".gw*"))
+
+    def remove_worker_files(self):
+        """Delete the result files of the xdist workers"""
+        for worker_path in self.worker_files():
+            os.remove(worker_path)
+
+    def write(self, record):
+        """Write one record as a JSON line"""
+        record["worker"] = self.worker
+        line = json.dumps(record, default=str) + "\n"
+        with self.lock:
+            self.handle.write(line)
+            self.handle.flush()
+
+    def pytest_gherkin_step_finished(self, step, scenario, status, duration):
+        """Step record"""
+        self.write(
+            dict(
+                type="step",
+                feature=scenario.feature.nodeid,
+                scenario=scenario.nodeid,
+                keyword=scenario.feature.get_step_keyword(step.gherkin_step),
+                step=step.step_text,
+                line=step.gherkin_step["locations"][-1]["line"],
+                parameters=step.call_parameters,
+                status=status,
+                duration=duration,
+            )
+        )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """Scenario record, one for every scenario: from the call report,
+        or from the setup report if the scenario did not run"""
+        outcome = yield
+        report = outcome.get_result()
+        if not hasattr(item, "scenario"):
+            return
+        if report.when == "call" or (report.when == "setup" and not report.passed):
+            self.write(
+                dict(
+                    type="scenario",
+                    feature=item.feature.nodeid,
+                    scenario=item.nodeid,
+                    name=item.scenario["name"],
+                    tags=[tag["name"] for tag in item.scenario["tags"]],
+                    status=report.outcome,
+                    when=report.when,
+                    duration=report.duration,
+                )
+            )
+
+    def pytest_unconfigure(self):
+        """Close the file at the end, the controller merges the worker files"""
+        if self.worker is None:
+            for worker_path in self.worker_files():
+                with open(worker_path, encoding="utf-8") as worker_handle:
+                    shutil.copyfileobj(worker_handle, self.handle)
+                os.remove(worker_path)
+        self.handle.close()
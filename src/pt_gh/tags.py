@@ -0,0 +1,108 @@
+"""Pytest Gherkin plugin tag expressions
+
+Cucumber style tag expressions, like "@smoke and not (@slow or @wip)",
+compiled to a Python function and evaluated on the Gherkin pickle tags.
+"""
+
+import functools
+import re
+
+
+TOKEN_RE = re.compile(r"\(|\)|[^\s()]+")
+OPERATORS = ("and", "or", "not", "(", ")")
+
+
+class TagExpressionError(Exception):
+    """Tag expression syntax problem"""
+
+
+class TagExpression:
+
+    """Compiled tag expression, with "not", "and", "or" and parentheses"""
+
+    def __init__(self, text):
+        self.text = text
+        self.tags = set()  # Tags referred by the expression
+        self.tokens = TOKEN_RE.findall(text)
+        self.position = 0
+        source = self._parse_or()
+        if self.position != len(self.tokens):
+            self._error("unexpected '{}'".format(self.tokens[self.position]))
+        self.evaluate = eval(  # pylint: disable=eval-used
+            "lambda tags: " + source, {"__builtins__": {}}
+        )
+        # Result for tags, which are not referred by the expression
+        self.default = self.evaluate(frozenset())
+
+    def may_match(self, tags):
+        """Check whether a scenario with some of the given tags can match.
+        Tags not referred by the expression do not change the result."""
+        return self.default or not self.tags.isdisjoint(tags)
+
+    def _error(self, msg):
+        """Report a syntax problem"""
+        raise TagExpressionError("Bad tag expression: {} ({})".format(self.text, msg))
+
+    def _next(self):
+        """Return the next token, or None at the end"""
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _parse_or(self):
+        """or_expr: and_expr ("or" and_expr)*"""
+        source = self._parse_and()
+        while self._next() == "or":
+            self.position += 1
+            source = "({} or {})".format(source, self._parse_and())
+        return source
+
+    def _parse_and(self):
+        """and_expr: not_expr ("and" not_expr)*"""
+        source = self._parse_not()
+        while self._next() == "and":
+            self.position += 1
+            source = "({} and {})".format(source, self._parse_not())
+        return source
+
+    def _parse_not(self):
+        """not_expr: "not" not_expr | "(" or_expr ")" | tag"""
+        token = self._next()
+        if token is None:
+            self._error("unexpected end")
+        self.position += 1
+        if token == "not":
+            return "(not {})".format(self._parse_not())
+        if token == "(":
+            source = self._parse_or()
+            if self._next() != ")":
+                self._error("missing ')'")
+            self.position += 1
+            return source
+        if token in OPERATORS:
+            self._error("unexpected '{}'".format(token))
+        tag = token if token.startswith("@") else "@" + token
+        self.tags.add(tag)
+        return "({!r} in tags)".format(tag)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_expression(text):
+    """Return the compiled tag expression, or None for empty expression"""
+    if not text or not text.strip():
+        return None
+    return TagExpression(text)
+
+
+def scan_tags(gherkin_text):
+    """Tag index of a feature file: all tags, without Gherkin parsing.
+    Tag lines are split as the Gherkin library does, comments included.
+    It may contain more, e.g. from doc strings, but never less."""
+    tags = set()
+    for line in gherkin_text.splitlines():
+        line = line.strip()
+        if not line.startswith("@"):
+            continue
+        for item in line.split("@")[1:]:
+            tags.add("@" + item.strip())
+    return tags
@@ -0,0 +1,177 @@
+"""Pytest Gherkin plugin concurrent scenario execution
+
+Scenarios are I/O bound usually, so they can run on a thread pool
+inside the same Pytest process. Function scoped fixtures are created
+for every scenario separately, module scoped ones for every feature file,
+wider scoped fixtures are shared.
+Scenarios tagged with @serial, or marked with skip, skipif or xfail
+are running alone, with the normal Pytest runtest protocol.
+"""
+
+# pragma pylint: disable=protected-access
+
+import collections
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from _pytest.fixtures import FuncFixtureInfo
+from _pytest.runner import CallInfo
+
+from . import utils
+
+
+SERIAL_TAG = "@serial"
+PROTOCOL_MARKS = ("skip", "skipif", "xfail")  # Handled by Pytest runtest hooks
+
+
+def is_threaded(item):
+    """Check whether the scenario can run concurrently with others"""
+    if any(tag["name"] == SERIAL_TAG for tag in item.scenario["tags"]):
+        return False
+    return all(item.get_closest_marker(name) is None for name in PROTOCOL_MARKS)
+
+
+def _copy_fixturedef(fixturedef):
+    """Fixture definition copy, without cached value and finalizers"""
+    fixturedef = copy.copy(fixturedef)
+    fixturedef.cached_result = None
+    fixturedef._finalizers = []
+    return fixturedef
+
+
+class ThreadedRunner:
+
+    """Run the scenarios of a session on a thread pool"""
+
+    def __init__(self, session, workers):
+        self.session = session
+        self.workers = workers
+        self.lock = threading.Lock()  # Pytest fixture handling is not thread safe
+        self.feature_fixturedefs = dict()  # Module scoped definitions per feature
+        self.remaining = collections.Counter()  # Items not run yet per feature
+
+    def fixture_info(self, item):
+        """Return a copy of the fixture closure with own fixture definitions.
+        Pytest caches the fixture value in its definition, so scenarios running
+        at the same time cannot share the function scoped ones and feature files
+        cannot share the module scoped ones. Wider scoped ones are shared."""
+        fixtureinfo = item._fixtureinfo
+        name2fixturedefs = dict()
+        for name, fixturedefs in fixtureinfo.name2fixturedefs.items():
+            name2fixturedefs[name] = tuple(
+                self._own_fixturedef(item, fixturedef) for fixturedef in fixturedefs
+            )
+        return FuncFixtureInfo(
+            fixtureinfo.argnames,
+            fixtureinfo.initialnames,
+            fixtureinfo.names_closure,
+            name2fixturedefs,
+        )
+
+    def _own_fixturedef(self, item, fixturedef):
+        """Fixture definition for the item, based on the scope"""
+        if fixturedef.scope in ("function", "class"):
+            return _copy_fixturedef(fixturedef)
+        if fixturedef.scope == "module":
+            key = (item.feature, fixturedef)
+            if key not in self.feature_fixturedefs:
+                self.feature_fixturedefs[key] = _copy_fixturedef(fixturedef)
+            return self.feature_fixturedefs[key]
+        return fixturedef
+
+    def run(self):
+        """Run all items, consecutive threaded items are running together,
+        others are running with the normal Pytest runtest protocol"""
+        setupstate = self.session._setupstate
+        # Session scoped fixtures are kept until the end
+        setupstate.prepare(self.session)
+        items = self.session.items
+        self.remaining = collections.Counter(item.feature for item in items)
+        batch = []
+        for index, item in enumerate(items):
+            item._fixtureinfo = self.fixture_info(item)
+            if is_threaded(item):
+                batch.append(item)
+                continue
+            self.run_batch(batch)
+            batch = []
+            if self.session.shouldfail or self.session.shouldstop:
+                break
+            nextitem = items[index + 1] if index + 1 < len(items) else None
+            item.ihook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+            # Pytest tears down the feature after its last item
+            self.remaining[item.feature] -= 1
+        else:
+            self.run_batch(batch)
+        # Stopped run, Pytest tears down the unfinished features at the end
+        for feature, count in self.remaining.items():
+            if count and feature in setupstate._finalizers:
+                if feature not in setupstate.stack:
+                    setupstate.stack.append(feature)
+
+    def run_batch(self, items):
+        """Run the items concurrently and report them in the main thread"""
+        if not items or self.session.shouldfail or self.session.shouldstop:
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.run_item, item) for item in items]
+            for item, future in zip(items, futures):
+                calls, messages = future.result()
+                self.remaining[item.feature] -= 1
+                if not self.remaining[item.feature]:
+                    calls.extend(self.finish_feature(item.feature))
+                self.report_item(item, calls, messages)
+                if self.session.shouldfail or self.session.shouldstop:
+                    for pending in futures:
+                        pending.cancel()
+                    return
+
+    def run_item(self, item):
+        """Setup, run and teardown of one item, called in a worker thread"""
+        utils.start_buffer()
+        try:
+            setup = CallInfo.from_call(lambda: self.setup_item(item), "setup")
+            calls = [setup]
+            if setup.excinfo is None:
+                calls.append(CallInfo.from_call(item.runtest, "call"))
+            teardown = CallInfo.from_call(lambda: self.teardown_item(item), "teardown")
+            calls.append(teardown)
+        finally:
+            messages = utils.stop_buffer()
+        return calls, messages
+
+    def setup_item(self, item):
+        """Pytest setup of the scenario, with its own fixture definitions"""
+        with self.lock:
+            item.setup()
+
+    def teardown_item(self, item):
+        """Finalize the function scoped fixtures of the scenario"""
+        with self.lock:
+            self.session._setupstate._callfinalizers(item)
+
+    def finish_feature(self, feature):
+        """Finalize the module scoped fixtures after the last scenario of the
+        feature, return the failed finalizer calls to report with that scenario"""
+        setupstate = self.session._setupstate
+        with self.lock:
+            if feature in setupstate.stack:
+                setupstate.stack.remove(feature)
+            finalizers = setupstate._finalizers.pop(feature, [])
+            calls = [
+                CallInfo.from_call(finalizer, "teardown")
+                for finalizer in reversed(finalizers)
+            ]
+            feature.teardown()
+        return [call for call in calls if call.excinfo is not None]
+
+    @staticmethod
+    def report_item(item, calls, messages):
+        """Pytest reporting of an executed item, scenario output kept together"""
+        utils.write_buffer(messages)
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for call in calls:
+            report = item.ihook.pytest_runtest_makereport(item=item, call=call)
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
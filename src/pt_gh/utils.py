@@ -1,10 +1,13 @@
 """Pytest Gherkin plugin utilities"""
 
+import threading
+
 
 TREP = None
 REPORT = False
 DEBUG = False
 FIRST = True
+_LOCAL = threading.local()
 
 
 def set_config(config):
@@ -15,9 +18,33 @@ def set_config(config):
     DEBUG = config.getoption("bdd_debug")
 
 
+def start_buffer():
+    """Start collecting the messages of the current thread,
+    instead of writing them directly to the terminal"""
+    _LOCAL.buffer = []
+
+
+def stop_buffer():
+    """Stop collecting messages of the current thread
+    and return the collected ones"""
+    buffer = getattr(_LOCAL, "buffer", None)
+    _LOCAL.buffer = None
+    return buffer or []
+
+
+def write_buffer(buffer):
+    """Write out previously collected messages, in one block"""
+    for msg, markup in buffer:
+        _write_msg(msg, **markup)
+
+
 def _write_msg(msg, **markup):
     """Low level writer wrapper"""
     global FIRST
+    buffer = getattr(_LOCAL, "buffer", None)
+    if buffer is not None:
+        buffer.append((msg, markup))
+        return
     if FIRST:
         msg = "\n" + msg
         FIRST = False
@@ -0,0 +1,3 @@
+"""Pytest Gherkin plugin tests configuration"""
+
+pytest_plugins = "pytester"
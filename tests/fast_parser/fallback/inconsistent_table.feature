@@ -0,0 +1,5 @@
+Feature: Inconsistent cell count
+    Scenario: Bad table
+        Given a table
+            | a | b |
+            | 1 |
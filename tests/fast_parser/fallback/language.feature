@@ -0,0 +1,4 @@
+# language: fr
+Fonctionnalité: Langue française
+    Scénario: Premier
+        Soit une étape
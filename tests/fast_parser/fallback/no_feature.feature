@@ -0,0 +1,2 @@
+# language: en
+# Only comments
@@ -0,0 +1,4 @@
+Feature: Tag at the end
+    Scenario: Last
+        Given a step
+    @dangling
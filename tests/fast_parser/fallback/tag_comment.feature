@@ -0,0 +1,4 @@
+Feature: Comment in a tag line
+    @tag # comment
+    Scenario: Tagged
+        Given a step
@@ -0,0 +1,5 @@
+Feature: Doc string without end
+    Scenario: Unclosed
+        Given a doc string
+            """
+            never closed
@@ -0,0 +1,5 @@
+Ability: Feature keyword synonym
+    Scenario: First
+        Given the first scenario
+    Scenario: Second
+        Given the second scenario
@@ -0,0 +1,29 @@
+Feature: Doc strings
+
+    Scenario: Quote separator
+        Given a doc string
+            """
+            First line
+                indented line
+            line with \"\"\" escaped quotes
+
+            after an empty line
+            """
+        And an other one
+          """
+        less indented than the separator
+                more indented
+          """
+
+    Scenario: Backtick separator
+        Given a backtick doc string
+            ```
+            code = "text"
+            ```
+        When an empty doc string
+            """
+            """
+        Then a doc string with content type
+            """json
+            {"key": "value"}
+            """
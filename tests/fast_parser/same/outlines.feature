@@ -0,0 +1,44 @@
+Feature: Scenario outlines
+
+    Background:
+        Given a background step
+
+    Scenario Outline: Outline with <first> and <second>
+        Given the <first> value
+        When I use <second> and <first> again
+        Then the result is <result>
+        And the table is
+            | <first> | constant | <second><first> |
+            | 1       | 2        | 3               |
+        But the doc string is
+            """
+            first: <first>
+              second: <second>
+            """
+
+        Examples: Numbers
+            | first | second | result |
+            | 1     | 2      | 3      |
+            | 10    | 20     | 30     |
+
+        Examples: Empty values
+            | first | second | result |
+            |       | x      |        |
+
+    Scenario Template: Template keyword
+        * the <value> is used
+
+        Scenarios:
+            | value |
+            | a     |
+
+    Scenario Outline: Outline without examples
+        Given no pickle is created
+
+    Scenario Outline: Outline without steps
+
+        Examples:
+            | value |
+            | a     |
+
+    Scenario: Scenario without steps
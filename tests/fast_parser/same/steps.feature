@@ -0,0 +1,27 @@
+# A comment before the feature
+# language: en
+Business Need: All step keywords
+    Free form description
+    with more lines
+
+    # Comment in the description
+    Background: Named background
+        Given the background
+        * a star step
+
+    Scenario: Keywords
+        Given a given step
+        When a when step
+        Then a then step
+        And an and step
+        But a but step
+        * a star step
+
+    # Comment between scenarios
+    Scenario:No space after the colon
+        Given   extra spaces around the text   
+
+    Scenario: Description of the scenario
+        Scenario description lines
+        are not needed for pickles
+        Given a step after the description
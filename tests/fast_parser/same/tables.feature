@@ -0,0 +1,9 @@
+Feature: Data tables with escapes
+
+    Scenario: Escaped cells
+        Given a data table
+            | pipe \| inside | back\\slash | new\nline | other \t escape |
+            |   padded       |             |x|  |
+        And a one column table
+            |one|
+            |  two  |
@@ -0,0 +1,5 @@
+Feature: Tab indentation
+	Scenario: Tab indented
+		Given a tab indented step
+		And a tab indented table
+			| a	| b |
@@ -0,0 +1,27 @@
+@feature @smoke
+Feature: Tags on every level
+    Tags of the feature are inherited by the scenarios
+    and the examples tags by the outline scenarios.
+
+    @first   @second
+    @third
+    Scenario: Tagged scenario
+        Given a tagged scenario
+
+    Scenario: Untagged scenario
+        Given only the feature tags
+
+    @outline
+    Scenario Outline: Tagged outline <name>
+        Given the value <value>
+
+        @examples
+        Examples: First examples
+            | name | value |
+            | one  | 1     |
+
+        @other @examples
+        Examples:
+            | name | value |
+            | two  | 2     |
+            | three | 3    |
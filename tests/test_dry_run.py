@@ -0,0 +1,60 @@
+"""Pytest Gherkin plugin dry run tests"""
+
+import json
+
+CONFTEST = """
+import pytest
+
+from pt_gh.plugin import step
+
+
+@pytest.fixture
+def sess({}):
+    return dict()
+
+
+@step("a session")
+def a_session(sess):
+    pass
+"""
+
+FEATURE = """
+Feature: Dry run
+    Scenario: Session
+        Given a session
+"""
+
+
+def dry_run(testdir, *args):
+    """Run the dry run and return the JSON report"""
+    result = testdir.runpytest_subprocess("--bdd_dry_run_report", "report.json", *args)
+    with testdir.tmpdir.join("report.json").open() as handle:
+        return result, json.load(handle)
+
+
+def test_dry_run_without_bdd_option(testdir):
+    """Dry run implies BDD execution, nothing runs"""
+    testdir.makeconftest(CONFTEST.format(""))
+    testdir.makefile(".feature", test=FEATURE)
+    result = testdir.runpytest_subprocess("--bdd_dry_run")
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(["*Dry run: 1 scenarios are valid*"])
+    result.stdout.no_fnmatch_line("*passed*")
+
+
+def test_cache_follows_fixture_changes(testdir):
+    """Changed fixture arguments invalidate the cached result"""
+    testdir.makeconftest(CONFTEST.format(""))
+    testdir.makefile(".feature", test=FEATURE)
+    result, report = dry_run(testdir)
+    assert result.ret == 0
+    assert report["ok"] and not report["features"][0]["cached"]
+    result, report = dry_run(testdir)
+    assert report["ok"] and report["features"][0]["cached"]
+    testdir.makeconftest(CONFTEST.format("nonexistent"))
+    result, report = dry_run(testdir)
+    assert result.ret == 1
+    assert not report["ok"] and not report["features"][0]["cached"]
+    scenario = report["features"][0]["scenarios"][0]
+    assert scenario["missing_fixtures"] == ["nonexistent"]
+    result.stdout.fnmatch_lines(["*Missing fixture: nonexistent*"])
@@ -0,0 +1,119 @@
+"""Pytest Gherkin plugin fast parser tests, differential to the Gherkin library"""
+
+import pathlib
+import random
+
+import pytest
+from gherkin.parser import Parser
+from gherkin.pickles import compiler
+
+from pt_gh import fast_parser
+
+HERE = pathlib.Path(__file__).parent
+SAME_FILES = sorted((HERE / "fast_parser" / "same").glob("*.feature")) + sorted(
+    (HERE.parent / "examples" / "features").glob("*.feature")
+)
+FALLBACK_FILES = sorted((HERE / "fast_parser" / "fallback").glob("*.feature"))
+
+# Line fragments for the generated feature files, valid and invalid ones
+# fmt: off
+FRAGMENTS = [
+    "Feature: f", "  Feature: g", "@a", "@a @b", "  @t1  @t2 ", "@x#c", "@x #c",
+    "Background:", "  Background: bg", "Scenario: s1", "  Scenario: s <a>",
+    "Scenario Outline: o <a> <b>", "Scenario Template: t", "Examples:",
+    "  Scenarios: ex", "  Given I have <a>", "  When x", "Then y <b>", "  And z",
+    "But w", "* star", "Given", "  | a | b |", "| <a> | x\\|y |", "|1|2|",
+    "| 1 | 2 | 3 |", "| c\\nd | \\\\ |", '  """', '"""json', "  ```", "```",
+    "    text <a>", '  \\"\\"\\"', "", "   ", "# comment", "  # language: en",
+    "# language: fr", "some description", "As a user", "  I want", "| only", "|",
+    "||", "\t Given tab", "Given  spaces  ", "Scenario:", "Examples: <a>",
+    "Business Need: n", "Ability: x", "Scenario:no space",
+]
+# fmt: on
+
+
+def parse_with_gherkin(text):
+    """Reference pickles from the Gherkin library"""
+    return compiler.compile(Parser().parse(text))
+
+
+def fragment_feature(rnd):
+    """Random lines, mostly invalid Gherkin"""
+    lines = []
+    if rnd.random() < 0.8:
+        lines.append(rnd.choice(["Feature: f", "@ft\nFeature: x\n  desc"]))
+    lines.extend(rnd.choice(FRAGMENTS) for _ in range(rnd.randint(1, 30)))
+    return "\n".join(lines) + rnd.choice(["", "\n", "\n\n"])
+
+
+def structured_feature(rnd):
+    """Random but valid Gherkin, with scenarios and outlines"""
+    lines = ["@feature", "Feature: F", "  description"]
+    if rnd.random() < 0.5:
+        lines += ["Background:", "  Given background step"]
+    for i in range(rnd.randint(1, 5)):
+        if rnd.random() < 0.5:
+            lines.append("@s{} @common".format(i))
+        if rnd.random() < 0.5:
+            lines.append("Scenario: scenario {}".format(i))
+            for j in range(rnd.randint(0, 4)):
+                keyword = rnd.choice(["Given", "When", "Then", "And", "But", "*"])
+                lines.append("  {} step {} {}".format(keyword, i, j))
+                argument = rnd.random()
+                if argument < 0.2:
+                    lines += ["    | a | b |", "    | 1 | 2 |"]
+                elif argument < 0.4:
+                    lines += ['    """', "    line1", "      line2", "", '    """']
+        else:
+            lines.append("Scenario Outline: outline <x> {}".format(i))
+            for j in range(rnd.randint(0, 3)):
+                lines.append("  Given value <x> and <y> {}".format(j))
+                argument = rnd.random()
+                if argument < 0.3:
+                    lines += ["    | <x> | c |"]
+                elif argument < 0.6:
+                    lines += ["    ```", "    <y> text", "    ```"]
+            for k in range(rnd.randint(0, 2)):
+                if rnd.random() < 0.5:
+                    lines.append("  @examples{}".format(k))
+                lines.append("  Examples: examples {}".format(k))
+                lines.append("    | x | y |")
+                for m in range(rnd.randint(0, 3)):
+                    lines.append("    | {0} | v{0} |".format(m))
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize("path", SAME_FILES, ids=lambda path: path.name)
+def test_same_pickles(path):
+    """Fast parser creates the same pickles as the Gherkin library"""
+    text = path.read_text(encoding="utf-8")
+    assert fast_parser.compile_pickles(text) == parse_with_gherkin(text)
+
+
+@pytest.mark.parametrize("path", FALLBACK_FILES, ids=lambda path: path.name)
+def test_fallback(path):
+    """Fast parser refuses the not supported files"""
+    with pytest.raises(fast_parser.Unsupported):
+        fast_parser.compile_pickles(path.read_text(encoding="utf-8"))
+
+
+def test_fallback_carriage_return():
+    """Carriage returns are left to the Gherkin library"""
+    with pytest.raises(fast_parser.Unsupported):
+        fast_parser.compile_pickles("Feature: f\r\n  Scenario: s\r\n    Given x\r\n")
+
+
+@pytest.mark.parametrize("generator", [fragment_feature, structured_feature])
+def test_generated_features(generator):
+    """Fast parser either falls back or creates the same pickles"""
+    rnd = random.Random(generator.__name__)
+    same = 0
+    for _ in range(1000):
+        text = generator(rnd)
+        try:
+            pickles = fast_parser.compile_pickles(text)
+        except fast_parser.Unsupported:
+            continue
+        assert pickles == parse_with_gherkin(text), text
+        same += 1
+    assert same  # Not everything falls back
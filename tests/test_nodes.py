@@ -0,0 +1,121 @@
+"""Pytest Gherkin plugin node tests"""
+
+import pytest
+
+CONFTEST = """
+import pytest
+
+from pt_gh.plugin import step
+
+EVENTS = []
+
+
+@pytest.fixture(scope="module")
+def feature_data(request):
+    EVENTS.append("setup " + request.node.name)
+    yield []
+    EVENTS.append("teardown " + request.node.name)
+
+
+@step("the feature data has {count:d} items")
+def feature_data_has(count, feature_data):
+    feature_data.append(count)
+    assert len(feature_data) == count
+
+
+def pytest_sessionfinish():
+    # Threaded scenarios of the two features can run together
+    assert sorted(EVENTS) == [
+        "setup first.feature",
+        "setup second.feature",
+        "teardown first.feature",
+        "teardown second.feature",
+    ], EVENTS
+"""
+
+FEATURE = """
+Feature: Module scope
+    Scenario: One
+        Given the feature data has 1 items
+
+    @serial
+    Scenario: Two
+        Given the feature data has 2 items
+
+    Scenario: Three
+        Given the feature data has 3 items
+"""
+
+
+@pytest.mark.parametrize("threads", ["0", "2"])
+def test_module_scope_is_feature(testdir, threads):
+    """Module scoped fixture instance is shared by the scenarios of a feature"""
+    testdir.makeconftest(CONFTEST)
+    testdir.makefile(".feature", first=FEATURE, second=FEATURE)
+    result = testdir.runpytest_subprocess("--bdd", "--bdd_threads", threads)
+    result.assert_outcomes(passed=6)
+    assert result.ret == 0
+
+
+PREFIX_CONFTEST = """
+import pytest
+
+from pt_gh.plugin import step
+
+
+@pytest.fixture
+def expensive(request):
+    open("created_" + request.node.name, "w").close()
+
+
+@step("the common step fails")
+def common_fails():
+    assert False
+
+
+@step("it needs an expensive fixture")
+def it_needs_expensive(expensive):
+    pass
+"""
+
+PREFIX_FEATURE = """
+Feature: Failed prefix
+    @serial
+    Scenario: First
+        Given the common step fails
+
+    Scenario: Second
+        Given the common step fails
+        And it needs an expensive fixture
+"""
+
+
+@pytest.mark.parametrize("threads", ["0", "2"])
+@pytest.mark.parametrize("mode", ["skip", "fail"])
+def test_failed_prefix_before_fixtures(testdir, mode, threads):
+    """Scenario with already failed first step is skipped or failed
+    before fixture setup, failure is reported as a failed test, not an error"""
+    testdir.makeconftest(PREFIX_CONFTEST)
+    testdir.makefile(".feature", test=PREFIX_FEATURE)
+    result = testdir.runpytest_subprocess(
+        "--bdd", "--bdd_failed_prefix", mode, "--bdd_threads", threads
+    )
+    if mode == "skip":
+        result.assert_outcomes(failed=1, skipped=1)
+    else:
+        result.assert_outcomes(failed=2)
+        result.stdout.fnmatch_lines(
+            ["*_ Second _*", "Step already failed in test.feature::First: *"]
+        )
+    assert not testdir.tmpdir.listdir("created_*")
+
+
+def test_failed_prefix_not_from_xfail(testdir):
+    """Expected failure does not stop the later scenarios"""
+    testdir.makeconftest(PREFIX_CONFTEST)
+    testdir.makefile(
+        ".feature", test=PREFIX_FEATURE.replace("@serial", "@serial @xfail")
+    )
+    result = testdir.runpytest_subprocess("--bdd", "--bdd_failed_prefix", "skip")
+    result.assert_outcomes(failed=1, xfailed=1)
+    assert testdir.tmpdir.listdir("created_*")
@@ -0,0 +1,108 @@
+"""Pytest Gherkin plugin result file tests"""
+
+import json
+
+import pytest
+
+CONFTEST = """
+import pytest
+
+from pt_gh.plugin import step
+
+
+@pytest.fixture
+def broken():
+    raise RuntimeError("broken fixture")
+
+
+@step("it passes")
+def it_passes():
+    pass
+
+
+@step("it fails")
+def it_fails():
+    assert False
+
+
+@step("it needs a broken fixture")
+def it_needs_broken(broken):
+    pass
+
+
+@step("it needs a missing fixture")
+def it_needs_missing(missing):
+    pass
+"""
+
+FEATURE = """
+Feature: Results
+    Scenario: Passing
+        Given it passes
+        And it passes
+
+    Scenario: Failing
+        Given it fails
+        And it passes
+
+    Scenario: Broken fixture
+        Given it needs a broken fixture
+
+    Scenario: Missing fixture
+        Given it needs a missing fixture
+"""
+
+
+def run_with_results(testdir, *args):
+    """Run the feature and return the result records"""
+    testdir.makeconftest(CONFTEST)
+    testdir.makefile(".feature", test=FEATURE)
+    testdir.runpytest_subprocess("--bdd", "--bdd_results", "results.jsonl", *args)
+    assert testdir.tmpdir.listdir("results.jsonl*") == [
+        testdir.tmpdir.join("results.jsonl")
+    ]
+    with testdir.tmpdir.join("results.jsonl").open() as handle:
+        return [json.loads(line) for line in handle]
+
+
+def check_records(records):
+    """Every scenario has exactly one record, steps of run scenarios too"""
+    scenarios = {
+        record["name"]: (record["status"], record["when"])
+        for record in records
+        if record["type"] == "scenario"
+    }
+    assert len(scenarios) == len([r for r in records if r["type"] == "scenario"])
+    assert scenarios == {
+        "Passing": ("passed", "call"),
+        "Failing": ("failed", "call"),
+        "Broken fixture": ("failed", "setup"),
+        "Missing fixture": ("failed", "setup"),
+    }
+    steps = [
+        (record["scenario"].split("::")[1], record["step"], record["status"])
+        for record in records
+        if record["type"] == "step"
+    ]
+    assert sorted(steps) == [
+        ("Failing", "it fails", "failed"),
+        ("Failing", "it passes", "skipped"),
+        ("Passing", "it passes", "passed"),
+        ("Passing", "it passes", "passed"),
+    ]
+
+
+@pytest.mark.parametrize("threads", ["0", "2"])
+def test_scenario_records(testdir, threads):
+    """Scenario records are written for setup failures too"""
+    records = run_with_results(testdir, "--bdd_threads", threads)
+    check_records(records)
+    assert {record["worker"] for record in records} == {None}
+
+
+def test_xdist_worker_files(testdir):
+    """xdist workers write own files, merged at the end"""
+    pytest.importorskip("xdist")
+    records = run_with_results(testdir, "-n", "2")
+    check_records(records)
+    assert {record["worker"] for record in records} <= {"gw0", "gw1"}
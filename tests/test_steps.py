@@ -0,0 +1,156 @@
+"""Pytest Gherkin plugin keyword scoped step tests"""
+
+CONFTEST = """
+from pt_gh.plugin import step
+
+
+@step("the value is {value:d}", kind="given")
+def given_value(value, context):
+    context.setdefault("kinds", []).append("given")
+    context["value"] = value
+
+
+@step("the value is {value:d}", kind="then")
+def then_value(value, context):
+    context.setdefault("kinds", []).append("then")
+    assert context["value"] == value
+
+
+@step("it is only a Then step", kind="then")
+def only_then(context):
+    context.setdefault("kinds", []).append("only then")
+
+
+@step("the kinds were {kinds}")
+def kinds_were(kinds, context):
+    assert ", ".join(context["kinds"]) == kinds
+"""
+
+
+def run_feature(testdir, feature, *files, conftest=CONFTEST):
+    """Run the feature with the steps"""
+    testdir.makeconftest(conftest)
+    for name, source in files:
+        testdir.makepyfile(**{name: source})
+    testdir.makefile(".feature", test=feature)
+    return testdir.runpytest_subprocess("--bdd")
+
+
+def test_continued_kinds(testdir):
+    """And, But and * continue the kind of the previous step"""
+    result = run_feature(
+        testdir,
+        """
+Feature: Kinds
+    Scenario: Continued
+        Given the value is 1
+        And the value is 1
+        Then the value is 1
+        And the value is 1
+        But the value is 1
+        * the value is 1
+        * the kinds were given, given, then, then, then, then
+""",
+    )
+    result.assert_outcomes(passed=1)
+
+
+def test_leading_continuation(testdir):
+    """Leading And or * has no kind, a single matching step is used"""
+    result = run_feature(
+        testdir,
+        """
+Feature: Kinds
+    Scenario: Leading And
+        And it is only a Then step
+        * the kinds were only then
+""",
+    )
+    result.assert_outcomes(passed=1)
+
+
+def test_leading_continuation_ambiguous(testdir):
+    """Leading * with steps of more kinds matching is an error"""
+    result = run_feature(
+        testdir,
+        """
+Feature: Kinds
+    Scenario: Leading star
+        * the value is 1
+""",
+    )
+    result.stdout.fnmatch_lines(
+        [
+            "*Step kind is not known, more steps match: the value is 1",
+            "*the value is {value:d} (given)",
+            "*the value is {value:d} (then)",
+        ]
+    )
+    assert "passed" not in result.stdout.str()
+
+
+def test_module_step_kind(testdir):
+    """BDD_STEP_KIND sets the kind of the steps of a module"""
+    then_steps = """
+from pt_gh.plugin import step
+
+BDD_STEP_KIND = "then"
+
+
+@step("the answer is {value:d}")
+def then_answer(value, context):
+    assert context["answer"] == value
+
+
+@step("the answer is {value:d}", kind="given")
+def given_answer(value, context):
+    context["answer"] = value
+"""
+    result = run_feature(
+        testdir,
+        """
+Feature: Kinds
+    Scenario: Module kind
+        Given the answer is 2
+        Then the answer is 2
+""",
+        ("test_then_steps", then_steps),
+    )
+    result.assert_outcomes(passed=1)
+
+
+def test_unknown_kind(testdir):
+    """Unknown step kind is refused"""
+    conftest = """
+from pt_gh.plugin import step
+
+
+@step("sometimes", kind="whenever")
+def sometimes():
+    pass
+"""
+    result = run_feature(
+        testdir,
+        "Feature: Kinds\n  Scenario: S\n    Given sometimes\n",
+        conftest=conftest,
+    )
+    output = result.stdout.str() + result.stderr.str()
+    assert "Unknown step kind: whenever sometimes" in output
+    assert result.ret != 0
+
+
+def test_feature_language(testdir):
+    """Keywords of the feature language give the kind"""
+    result = run_feature(
+        testdir,
+        """# language: fr
+Fonctionnalité: Genres
+    Scénario: Français
+        Soit the value is 4
+        Et the value is 4
+        Alors the value is 4
+        Mais the value is 4
+        * the kinds were given, given, then, then
+""",
+    )
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,138 @@
+"""Pytest Gherkin plugin tag expression tests"""
+
+import pytest
+
+from pt_gh import tags
+
+
+@pytest.mark.parametrize(
+    "text, scenario_tags, expected",
+    [
+        ("@a", {"@a"}, True),
+        ("@a", {"@b"}, False),
+        ("a", {"@a"}, True),  # Bare tag name
+        ("not @a", {"@b"}, True),
+        ("not @a", {"@a"}, False),
+        ("not not @a", {"@a"}, True),
+        ("@a or @b and @c", {"@a"}, True),  # "and" binds stronger
+        ("@a or @b and @c", {"@b"}, False),
+        ("@a or @b and @c", {"@b", "@c"}, True),
+        ("not @a and @b", {"@b"}, True),  # "not" binds strongest
+        ("not @a and @b", {"@a", "@b"}, False),
+        ("(@a or @b) and @c", {"@a"}, False),
+        ("(@a or @b) and @c", {"@a", "@c"}, True),
+        ("not (@a or @b)", {"@c"}, True),
+        ("@smoke and not (@slow or @wip)", {"@smoke", "@wip"}, False),
+    ],
+)
+def test_expression(text, scenario_tags, expected):
+    """Operator precedence, negation, parentheses and bare tag names"""
+    assert tags.compile_expression(text).evaluate(scenario_tags) is expected
+
+
+@pytest.mark.parametrize("text", ["", "   "])
+def test_empty_expression(text):
+    """Empty expression means no filtering"""
+    assert tags.compile_expression(text) is None
+
+
+@pytest.mark.parametrize("text", ["@a and", "(@a", "@a)", "and @a", "@a @b", "not"])
+def test_bad_expression(text):
+    """Syntax problems are reported"""
+    with pytest.raises(tags.TagExpressionError):
+        tags.compile_expression(text)
+
+
+def test_may_match():
+    """Only the tags referred by the expression can change the result"""
+    expression = tags.compile_expression("@a and not @b")
+    assert expression.tags == {"@a", "@b"}
+    assert expression.may_match({"@a"})
+    assert not expression.may_match({"@c"})
+    assert tags.compile_expression("not @b").may_match({"@c"})
+
+
+def test_scan_tags():
+    """Tag lines are split as the Gherkin library does"""
+    text = "@a@b\n  @c  @d # note @e\nFeature: f\n  Scenario: s @x\n"
+    assert tags.scan_tags(text) == {"@a", "@b", "@c", "@d # note", "@e"}
+
+
+CONFTEST = """
+from pt_gh.plugin import step
+
+
+@step("a step")
+def a_step():
+    pass
+"""
+
+FEATURE = """
+@feature
+Feature: Tags
+    @smoke
+    Scenario: Smoke
+        Given a step
+
+    @slow@smoke
+    Scenario: Slow smoke
+        Given a step
+
+    @outline
+    Scenario Outline: Outline <value>
+        Given a step
+
+        @fast
+        Examples:
+            | value |
+            | one   |
+
+        Examples:
+            | value |
+            | two   |
+"""
+
+
+def collected(testdir, expression):
+    """Return the collected scenario names for the tag expression"""
+    testdir.makeconftest(CONFTEST)
+    testdir.makefile(".feature", test=FEATURE)
+    testdir.makefile(
+        ".feature", other="Feature: Other\n  Scenario: Other\n    Given a step\n"
+    )
+    result = testdir.runpytest_subprocess(
+        "--bdd", "--bdd_debug", "--bdd_tags", expression, "--collect-only", "-q", "-s"
+    )
+    return result, [
+        line.split("::")[1] for line in result.stdout.lines if ".feature::" in line
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression, names",
+    [
+        ("@smoke", ["Slow_smoke", "Smoke"]),
+        ("@smoke and not @slow", ["Smoke"]),
+        ("@feature and not @smoke", ["Outline_one", "Outline_two"]),  # Inherited
+        ("@outline and @fast", ["Outline_one"]),  # Examples tag
+        ("not @feature", ["Other"]),
+    ],
+)
+def test_scenario_filtering(testdir, expression, names):
+    """Scenarios are selected by their own and inherited tags"""
+    _, scenario_names = collected(testdir, expression)
+    assert sorted(scenario_names) == names
+
+
+def test_file_skipped(testdir):
+    """Files without any matching tags are not parsed at all"""
+    result, _ = collected(testdir, "@smoke")
+    result.stdout.fnmatch_lines(["Skipping file by tags: *other.feature"])
+    result.stdout.no_fnmatch_line("Skipping file by tags: *test.feature")
+
+
+def test_bad_expression_usage_error(testdir):
+    """Bad expression on the command line is a usage error"""
+    result = testdir.runpytest_subprocess("--bdd", "--bdd_tags", "@a and")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*Bad tag expression: @a and (unexpected end)*"])
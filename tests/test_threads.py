@@ -0,0 +1,203 @@
+"""Pytest Gherkin plugin concurrent scenario execution tests"""
+
+CONFTEST = """
+import threading
+
+import pytest
+
+from pt_gh.plugin import step
+
+
+@pytest.fixture(scope="session")
+def barrier():
+    return threading.Barrier(2, timeout=5)
+
+
+@pytest.fixture
+def base():
+    return ["root"]
+
+
+@pytest.fixture
+def instances():
+    return []
+
+
+@step("all scenarios are running")
+def all_running(barrier):
+    barrier.wait()
+
+
+@step("scenario {name} is running")
+def scenario_running(name, instances):
+    instances.append(name)
+    assert instances == [name]
+
+
+@step("base is {value}")
+def base_is(value, base):
+    assert "/".join(base) == value
+
+
+@step("it fails")
+def it_fails():
+    assert False
+"""
+
+SUB_CONFTEST = """
+import pytest
+
+
+@pytest.fixture
+def base(base):
+    return base + ["sub"]
+"""
+
+
+def run_threaded(testdir, *features):
+    """Create the feature files and run them on 2 threads"""
+    testdir.makeconftest(CONFTEST)
+    for index, feature in enumerate(features):
+        testdir.makefile(".feature", **{"test{}".format(index): feature})
+    return testdir.runpytest_subprocess("--bdd", "--bdd_threads", "2")
+
+
+def test_scenarios_run_concurrently(testdir):
+    """Both scenarios must wait for each other on the barrier"""
+    result = run_threaded(
+        testdir,
+        """
+Feature: Concurrent
+    Scenario: First
+        Given all scenarios are running
+
+    Scenario: Second
+        Given all scenarios are running
+""",
+    )
+    result.assert_outcomes(passed=2)
+
+
+def test_function_fixtures_per_scenario(testdir):
+    """Function scoped fixture instances are not shared"""
+    result = run_threaded(
+        testdir,
+        """
+Feature: Own fixtures
+    Scenario: First
+        Given scenario first is running
+        And scenario first is running
+
+    Scenario: Second
+        Given scenario second is running
+""",
+    )
+    result.assert_outcomes(passed=1, failed=1)
+
+
+def test_overridden_fixture(testdir):
+    """Fixture overriding its parent with the same name"""
+    testdir.mkdir("sub").join("conftest.py").write(SUB_CONFTEST)
+    testdir.tmpdir.join("sub", "test_sub.feature").write(
+        """
+Feature: Override
+    Scenario: First
+        Given base is root/sub
+
+    Scenario: Second
+        Given base is root/sub
+"""
+    )
+    result = run_threaded(
+        testdir,
+        """
+Feature: Root
+    Scenario: Root
+        Given base is root
+""",
+    )
+    result.assert_outcomes(passed=3)
+
+
+def test_marked_scenarios(testdir):
+    """Skip and xfail marks from tags work like without threads"""
+    result = run_threaded(
+        testdir,
+        """
+Feature: Marks
+    @xfail
+    Scenario: Expected failure
+        Given it fails
+
+    @skip
+    Scenario: Skipped
+        Given it fails
+
+    @serial
+    Scenario: Serial
+        Given base is root
+
+    Scenario: Failure
+        Given it fails
+""",
+    )
+    result.assert_outcomes(passed=1, failed=1, skipped=1, xfailed=1)
+
+
+TEARDOWN_CONFTEST = """
+import pytest
+
+from pt_gh.plugin import step
+
+
+@pytest.fixture(scope="module")
+def first_resource():
+    yield
+    raise RuntimeError("first teardown")
+
+
+@pytest.fixture(scope="module")
+def second_resource():
+    yield
+    raise RuntimeError("second teardown")
+
+
+@step("resources are used")
+def resources_used(first_resource, second_resource):
+    pass
+
+
+@step("nothing is used")
+def nothing_used():
+    pass
+"""
+
+
+def test_feature_teardown_errors(testdir):
+    """Module fixture teardown errors belong to the last scenario of the feature"""
+    testdir.makeconftest(TEARDOWN_CONFTEST)
+    testdir.makefile(
+        ".feature",
+        test_a="""
+Feature: Resources
+    Scenario: First
+        Given resources are used
+
+    Scenario: Last
+        Given resources are used
+""",
+        test_b="""
+Feature: Other
+    Scenario: Other
+        Given nothing is used
+""",
+    )
+    result = testdir.runpytest_subprocess("--bdd", "--bdd_threads", "2", "-rE")
+    result.assert_outcomes(passed=3, error=2)
+    result.stdout.fnmatch_lines(
+        [
+            "ERROR test_a.feature::Last - RuntimeError: second teardown",
+            "ERROR test_a.feature::Last - RuntimeError: first teardown",
+        ],
+        consecutive=True,
+    )